@@ -1,5 +1,6 @@
 from .constants import *
 from . import utils
+from . import stats
 from .substitution_ciphers import *
 from .polyalphabetic_ciphers import *
 from .transposition_ciphers import *
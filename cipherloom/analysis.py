@@ -0,0 +1,251 @@
+import heapq
+import math
+import numpy as np
+
+from .substitution_ciphers import CaesarCipher, AffineCipher
+from .polyalphabetic_ciphers import VigenereCipher
+from .transposition_ciphers import TranspositionCipher
+from .polygraphic_ciphers import HillCipher
+from .keyspace import CaesarKeySpace, AffineKeySpace, VigenereKeySpace, HillKeySpace, TranspositionKeySpace
+from .recognizer import PlaintextRecognizer
+from .registry import offsetArgs
+from .stats import encodeLetterCodes
+from .utils import general_utils, math_utils
+from .utils.string_utils import filterAlphabetical
+
+"""
+Lazy decryption
+"""
+
+def letterHistogram(text) -> np.ndarray:
+    """
+    Returns the count of each letter (a-z) in text, ignoring case and non-alphabetical characters
+    """
+    return np.bincount(encodeLetterCodes(text), minlength=26)
+
+def lazyDecrypt(letters: str, decrypt, block_size: int):
+    """
+    Yields the decryption of letters block by block. decrypt(block, offset) decrypts a block starting offset letters into the message.
+    """
+    for offset in range(0, len(letters), block_size):
+        yield decrypt(letters[offset:offset + block_size], offset)
+
+def lazyTranspositionDecrypt(ciphertext: str, key, block_size: int):
+    """
+    Yields the columnar transposition decryption of ciphertext a few rows at a time, reading each row straight from the ciphertext columns
+    """
+    keyLength = len(key)
+    if len(ciphertext) % keyLength != 0:
+        raise ValueError("Ciphertext length must be a multiple of the key length")
+    rows = len(ciphertext) // keyLength
+    order = sorted(range(keyLength), key=lambda x: key[x])
+    columnStarts = [order.index(i) * rows for i in range(keyLength)]
+    rowsPerBlock = max(block_size // keyLength, 1)
+    for firstRow in range(0, rows, rowsPerBlock):
+        yield "".join(ciphertext[start + row] for row in range(firstRow, min(firstRow + rowsPerBlock, rows)) for start in columnStarts)
+
+"""
+End of lazy decryption
+"""
+
+"""
+Streaming top-k search
+"""
+
+class TopK:
+    """
+    Keeps the k highest scoring keys seen so far in a bounded heap, in constant memory however many keys are pushed.
+    TopK collections of disjoint key space shards (e.g. from parallel workers) can be merged.
+    """
+    def __init__(self, k: int):
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        self.k = k
+        self._heap = []
+        self._count = 0
+
+    @property
+    def threshold(self) -> float:
+        """
+        Score a key has to beat to enter the top k
+        """
+        return self._heap[0][0] if len(self._heap) >= self.k else -math.inf
+
+    def push(self, score: float, key) -> bool:
+        """
+        Offers a scored key, returning whether it entered the top k. Ties keep the key pushed first.
+        """
+        self._count += 1
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, (score, -self._count, key))
+            return True
+        if score > self._heap[0][0]:
+            heapq.heapreplace(self._heap, (score, -self._count, key))
+            return True
+        return False
+
+    def merge(self, other):
+        for score, key in other.results():
+            self.push(score, key)
+        return self
+
+    def results(self) -> list[tuple[float, object]]:
+        """
+        Returns the (score, key) pairs, best first
+        """
+        return [(score, key) for score, _, key in sorted(self._heap, reverse=True)]
+
+def scoreCandidates(candidates, recognizer: PlaintextRecognizer, best: TopK = None):
+    """
+    Lazily scores (key, plaintext chunks, plaintext letter histogram or letter count) candidates and yields (score, key) for each one
+    that is not abandoned. When best is given, candidates are abandoned once the recognizer's bound shows they cannot enter it.
+    """
+    for key, chunks, letters in candidates:
+        threshold = best.threshold if best is not None else -math.inf
+        if isinstance(letters, int):
+            score = recognizer.score(chunks, threshold=threshold, letter_count=letters)
+        else:
+            score = recognizer.score(chunks, letters, threshold)
+        if score is not None:
+            yield score, key
+
+def searchCandidates(candidates, recognizer: PlaintextRecognizer, top_k: int) -> TopK:
+    """
+    Streams candidates through the recognizer and returns the top_k best as a TopK
+    """
+    best = TopK(top_k)
+    for score, key in scoreCandidates(candidates, recognizer, best):
+        best.push(score, key)
+    return best
+
+"""
+End of streaming top-k search
+"""
+
+"""
+Candidate generators
+"""
+
+def caesarCandidates(ciphertext: str, keys = None, block_size = 64):
+    """
+    Yields a lazily decrypted candidate for each Caesar key (default: CaesarKeySpace)
+    """
+    letters = filterAlphabetical(ciphertext)
+    histogram = letterHistogram(letters)
+    cipher = CaesarCipher()
+    for key in (CaesarKeySpace() if keys is None else keys):
+        yield key, lazyDecrypt(letters, lambda block, offset, key=key: cipher.decrypt(block, key), block_size), np.roll(histogram, -key)
+
+def affineCandidates(ciphertext: str, keys = None, block_size = 64):
+    """
+    Yields a lazily decrypted candidate for each affine key (default: AffineKeySpace)
+    """
+    letters = filterAlphabetical(ciphertext)
+    histogram = letterHistogram(letters)
+    cipher = AffineCipher()
+    for a, b in (AffineKeySpace() if keys is None else keys):
+        yield (a, b), lazyDecrypt(letters, lambda block, offset, a=a, b=b: cipher.decrypt(block, a, b), block_size), histogram[(a * np.arange(26) + b) % 26]
+
+def vigenereCandidates(ciphertext: str, keys, block_size = 64):
+    """
+    Yields a lazily decrypted candidate for each Vigenère key, e.g. from a VigenereKeySpace or a list of candidate keys
+    """
+    letters = filterAlphabetical(ciphertext)
+    codes = encodeLetterCodes(letters)
+    residueHistograms = {}
+    cipher = VigenereCipher()
+    for key in keys:
+        if len(key) not in residueHistograms:
+            residueHistograms[len(key)] = [np.bincount(codes[r::len(key)], minlength=26) for r in range(len(key))]
+        histogram = sum(np.roll(residueHistogram, -shift) for residueHistogram, shift in zip(residueHistograms[len(key)], encodeLetterCodes(key)))
+        yield key, lazyDecrypt(letters, lambda block, offset, key=key: cipher.decrypt(block, *offsetArgs("vigenere", (key,), offset)), block_size), histogram
+
+def hillCandidates(ciphertext: str, keys, block_size = 64):
+    """
+    Yields a lazily decrypted candidate for each Hill key, e.g. from a HillKeySpace. Each candidate inverts its key matrix once
+    and then decrypts block by block. Keys that are not invertible mod 26 are skipped.
+    """
+    codes = encodeLetterCodes(ciphertext)
+    for key in keys:
+        keySize = math.isqrt(len(key))
+        if keySize * keySize != len(key):
+            continue
+        matrix = math_utils.toSquareMatrix(general_utils.encodeToAlphabetIndices(key), oneDim = True).tolist()
+        try:
+            inverseKey = np.array(math_utils.matrixInverseModN(matrix, 26))
+        except Exception:
+            # matrixInverseModN raises when the determinant has no inverse mod 26
+            continue
+        blocks = codes[:len(codes) - len(codes) % keySize].reshape(-1, keySize)
+        rowsPerBlock = max(block_size // keySize, 1)
+        chunks = ((((blocks[i:i + rowsPerBlock] @ inverseKey.T) % 26).ravel() + ord("a")).astype(np.uint8).tobytes()
+                  for i in range(0, len(blocks), rowsPerBlock))
+        yield key, chunks, int(blocks.size)
+
+def transpositionCandidates(ciphertext: str, keys, block_size = 64):
+    """
+    Yields a lazily decrypted candidate for each transposition column order, e.g. from a TranspositionKeySpace
+    """
+    histogram = letterHistogram(ciphertext)
+    for key in keys:
+        yield key, lazyTranspositionDecrypt(ciphertext, key, block_size), histogram
+
+"""
+End of candidate generators
+"""
+
+"""
+Brute force search
+"""
+
+def bruteForceCaesar(ciphertext: str, top_k = 3, recognizer = None, keys = None, block_size = 64) -> list[tuple[float, int, str]]:
+    """
+    Tries every Caesar shift (or the given keys, e.g. a key space shard) and returns the top_k most English-looking decryptions
+    as (score, key, plaintext), best first
+    """
+    best = searchCandidates(caesarCandidates(ciphertext, keys, block_size), recognizer or PlaintextRecognizer(), top_k)
+    return [(score, key, CaesarCipher().decrypt(ciphertext, key)) for score, key in best.results()]
+
+def bruteForceAffine(ciphertext: str, top_k = 3, recognizer = None, keys = None, block_size = 64) -> list[tuple[float, tuple[int, int], str]]:
+    """
+    Tries every valid affine key (a, b) (or the given keys) and returns the top_k most English-looking decryptions as (score, (a, b), plaintext), best first
+    """
+    best = searchCandidates(affineCandidates(ciphertext, keys, block_size), recognizer or PlaintextRecognizer(), top_k)
+    return [(score, key, AffineCipher().decrypt(ciphertext, *key)) for score, key in best.results()]
+
+def bruteForceVigenere(ciphertext: str, key_length = None, keys = None, top_k = 3, recognizer = None, block_size = 64) -> list[tuple[float, str, str]]:
+    """
+    Tries Vigenère keys, either the given candidate keys (or key space shard) or every key of key_length letters,
+    and returns the top_k most English-looking decryptions as (score, key, plaintext), best first
+    """
+    if (key_length is None) == (keys is None):
+        raise ValueError("Provide exactly one of key_length or keys")
+    keys = VigenereKeySpace(key_length) if keys is None else keys
+    best = searchCandidates(vigenereCandidates(ciphertext, keys, block_size), recognizer or PlaintextRecognizer(), top_k)
+    return [(score, key, VigenereCipher().decrypt(ciphertext, key)) for score, key in best.results()]
+
+def bruteForceHill(ciphertext: str, size = None, keys = None, top_k = 3, recognizer = None, block_size = 64) -> list[tuple[float, str, str]]:
+    """
+    Tries Hill keys, either the given keys (or key space shard) or every invertible size x size key,
+    and returns the top_k most English-looking decryptions as (score, key, plaintext), best first
+    """
+    if (size is None) == (keys is None):
+        raise ValueError("Provide exactly one of size or keys")
+    keys = HillKeySpace(size) if keys is None else keys
+    best = searchCandidates(hillCandidates(ciphertext, keys, block_size), recognizer or PlaintextRecognizer(), top_k)
+    return [(score, key, HillCipher().decrypt(ciphertext, key)) for score, key in best.results()]
+
+def bruteForceTransposition(ciphertext: str, key_length = None, keys = None, top_k = 3, recognizer = None, block_size = 64) -> list[tuple[float, tuple[int, ...], str]]:
+    """
+    Tries every column order of the given key length (or the given keys) and returns the top_k most English-looking decryptions
+    as (score, key, plaintext), best first. Keys are tuples of column ranks, which TranspositionCipher accepts like a key string.
+    """
+    if (key_length is None) == (keys is None):
+        raise ValueError("Provide exactly one of key_length or keys")
+    keys = TranspositionKeySpace(key_length) if keys is None else keys
+    best = searchCandidates(transpositionCandidates(ciphertext, keys, block_size), recognizer or PlaintextRecognizer(), top_k)
+    return [(score, key, TranspositionCipher().decrypt(ciphertext, key)) for score, key in best.results()]
+
+"""
+End of brute force search
+"""
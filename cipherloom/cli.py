@@ -0,0 +1,182 @@
+import argparse
+import mmap
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from .registry import CIPHERS, SEGMENTABLE_CIPHERS, POSITIONAL_CIPHERS, getCipher, parseKey, offsetArgs
+from .stats import encodeLetterCodes
+
+"""
+Command line interface for encrypting and decrypting files and directory trees
+"""
+
+DEFAULT_SEGMENT_SIZE = 8192
+
+def collectFiles(inputPath: str, outputPath: str) -> list[tuple[str, str]]:
+    """
+    Returns (input file, output file) pairs, mirroring a directory tree into outputPath if inputPath is a directory
+    """
+    if not os.path.isdir(inputPath):
+        return [(inputPath, outputPath)]
+    files = []
+    for root, _, names in os.walk(inputPath):
+        for name in sorted(names):
+            source = os.path.join(root, name)
+            files.append((source, os.path.join(outputPath, os.path.relpath(source, inputPath))))
+    return files
+
+def splitSegments(path: str, size: int, segment_size: int, positional: bool):
+    """
+    Yields (start, end, letter offset) byte ranges splitting a file into segments. The letter offset (number of letters before the segment)
+    is only counted for positional ciphers.
+    """
+    offset = 0
+    with open(path, "rb") as file:
+        for start in range(0, size, segment_size):
+            end = min(start + segment_size, size)
+            yield start, end, offset
+            if positional:
+                offset += len(encodeLetterCodes(file.read(end - start)))
+
+def processSegment(inputPath, outputPath, start, end, cipherName, args, decrypt):
+    """
+    Runs the cipher over bytes [start, end) of the input and writes the result at the same position of the pre-sized output
+    """
+    cipher = getCipher(cipherName)
+    function = cipher.decrypt if decrypt else cipher.encrypt
+    with open(inputPath, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as source:
+        message = source[start:end].decode("ascii")
+    result = function(message, *args)
+    if result is None:
+        raise ValueError(f"{cipherName} could not process {inputPath} with the given key")
+    result = result.encode("ascii")
+    if len(result) != end - start:
+        raise ValueError(f"{cipherName} changed the length of segment {start}-{end} of {inputPath}")
+    with open(outputPath, "r+b") as file, mmap.mmap(file.fileno(), 0) as target:
+        target[start:end] = result
+    return end - start
+
+def processWholeFile(inputPath, outputPath, cipherName, args, decrypt):
+    """
+    Runs a cipher that cannot be segmented (its output length depends on the whole message) over an entire file
+    """
+    cipher = getCipher(cipherName)
+    function = cipher.decrypt if decrypt else cipher.encrypt
+    with open(inputPath, "rb") as file:
+        message = file.read().decode("ascii")
+    result = function(message, *args)
+    if result is None:
+        raise ValueError(f"{cipherName} could not process {inputPath} with the given key")
+    with open(outputPath, "wb") as file:
+        file.write(result.encode("ascii"))
+    return len(message)
+
+class ProcessingError(Exception):
+    """
+    Raised when a worker fails on one of the input files
+    """
+
+def processFiles(files, cipherName, args, decrypt = False, workers = None, segment_size = DEFAULT_SEGMENT_SIZE) -> int:
+    """
+    Encrypts or decrypts every (input, output) file pair on a process pool and returns the number of input bytes processed.
+    Segmentable ciphers split each file into segments written straight into a memory-mapped output of the same size;
+    other ciphers process each file as a whole.
+
+    If a worker fails, no further work is started, the output files that were not completed are removed and ProcessingError is raised
+    naming the input file.
+    """
+    segmentable = cipherName in SEGMENTABLE_CIPHERS
+    positional = cipherName in POSITIONAL_CIPHERS
+    # Output files started so far, with the number of their tasks not yet finished. The file being split is not complete
+    # even when that number is 0, so it is tracked separately until the task generator moves on.
+    remaining = {}
+    current = None
+
+    def tasks():
+        nonlocal current
+        for inputPath, outputPath in files:
+            os.makedirs(os.path.dirname(os.path.abspath(outputPath)), exist_ok=True)
+            remaining[outputPath], current = 0, outputPath
+            if not segmentable:
+                yield inputPath, outputPath, (processWholeFile, inputPath, outputPath, cipherName, args, decrypt)
+                continue
+            size = os.path.getsize(inputPath)
+            with open(outputPath, "wb") as file:
+                file.truncate(size)
+            for start, end, offset in splitSegments(inputPath, size, segment_size, positional):
+                segmentArgs = offsetArgs(cipherName, args, offset) if positional else args
+                yield inputPath, outputPath, (processSegment, inputPath, outputPath, start, end, cipherName, segmentArgs, decrypt)
+        current = None
+
+    def collect(done) -> int:
+        processed = 0
+        for future in done:
+            inputPath, outputPath = submitted.pop(future)
+            try:
+                processed += future.result()
+            except Exception as error:
+                raise ProcessingError(f"could not process {inputPath}: {type(error).__name__}: {error}") from error
+            remaining[outputPath] -= 1
+        return processed
+
+    # Only a few tasks per worker are submitted at a time, so memory does not grow with the size of the input
+    window = (workers or os.cpu_count() or 1) * 4
+    totalBytes, submitted = 0, {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        try:
+            for inputPath, outputPath, task in tasks():
+                if len(submitted) >= window:
+                    done, _ = wait(submitted, return_when=FIRST_COMPLETED)
+                    totalBytes += collect(done)
+                submitted[executor.submit(*task)] = (inputPath, outputPath)
+                remaining[outputPath] += 1
+            totalBytes += collect(wait(submitted).done)
+        except ProcessingError:
+            executor.shutdown(wait=True, cancel_futures=True)
+            for outputPath, count in remaining.items():
+                if (count or outputPath == current) and os.path.exists(outputPath):
+                    os.remove(outputPath)
+            raise
+    return totalBytes
+
+def buildParser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cipherloom", description="Encrypt or decrypt files and directory trees with a classical cipher.")
+    parser.add_argument("mode", choices=["encrypt", "decrypt"])
+    parser.add_argument("cipher", choices=list(CIPHERS))
+    parser.add_argument("input", help="ASCII text file or directory to process")
+    parser.add_argument("-o", "--output", required=True, help="Output file, or output directory if input is a directory")
+    parser.add_argument("-k", "--key", default=None,
+                        help="Cipher key, e.g. 3 (caesar), 5,8 (affine), 4,desc (trithemius), LEMON (vigenere, monoalphabetic, transposition, hill, playfair)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Number of worker processes (default: number of CPUs)")
+    parser.add_argument("--segment-size", type=int, default=DEFAULT_SEGMENT_SIZE, help="Segment size in bytes for segmentable ciphers")
+    return parser
+
+def main(argv = None) -> int:
+    parser = buildParser()
+    options = parser.parse_args(argv)
+    if options.segment_size <= 0:
+        parser.error("--segment-size must be positive")
+    try:
+        args = parseKey(options.cipher, options.key)
+    except ValueError as error:
+        parser.error(str(error))
+    if not os.path.exists(options.input):
+        parser.error(f"{options.input} does not exist")
+
+    files = collectFiles(options.input, options.output)
+    startTime = time.perf_counter()
+    try:
+        totalBytes = processFiles(files, options.cipher, args, decrypt=options.mode == "decrypt",
+                                  workers=options.workers, segment_size=options.segment_size)
+    except (ProcessingError, OSError) as error:
+        print(f"cipherloom: error: {error}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - startTime
+    throughput = totalBytes / 1e6 / elapsed if elapsed > 0 else float("inf")
+    print(f"{options.mode.capitalize()}ed {len(files)} file(s), {totalBytes / 1e6:.2f} MB in {elapsed:.2f} s ({throughput:.2f} MB/s)", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,6 +10,26 @@ ALPHABET_UPPER = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
 ALPHABET_LOWER_REVERSE = ALPHABET_LOWER[::-1]
 ALPHABET_UPPER_REVERSE = ALPHABET_UPPER[::-1]
 
+# Most common English bigrams and their frequencies (percent of all bigrams)
+ENGLISH_BIGRAM_FREQUENCIES = {
+    "th": 3.56, "he": 3.07, "in": 2.43, "er": 2.05, "an": 1.99, "re": 1.85, "on": 1.76, "at": 1.49, "en": 1.45, "nd": 1.35,
+    "ti": 1.34, "es": 1.34, "or": 1.28, "te": 1.20, "of": 1.17, "ed": 1.17, "is": 1.13, "it": 1.12, "al": 1.09, "ar": 1.07,
+    "st": 1.05, "to": 1.04, "nt": 1.04, "ng": 0.95, "se": 0.93, "ha": 0.93, "as": 0.87, "ou": 0.87, "io": 0.83, "le": 0.83,
+    "ve": 0.83, "co": 0.79, "me": 0.79, "de": 0.76, "hi": 0.76, "ri": 0.73, "ro": 0.73, "ic": 0.70, "ne": 0.69, "ea": 0.69,
+    "ra": 0.69, "ce": 0.65, "li": 0.62, "ch": 0.60, "ll": 0.58, "be": 0.58, "ma": 0.57, "si": 0.55, "om": 0.55, "ur": 0.54,
+}
+
+# The 100 most common words in English by rank, as listed for the Oxford English Corpus (Wikipedia, "Most common words in English").
+# The corpus counts lemmas, so "be" stands for "is", "was", "were" and so on.
+COMMON_ENGLISH_WORDS = (
+    "the", "be", "to", "of", "and", "a", "in", "that", "have", "i", "it", "for", "not", "on", "with", "he", "as", "you", "do", "at",
+    "this", "but", "his", "by", "from", "they", "we", "say", "her", "she", "or", "an", "will", "my", "one", "all", "would", "there",
+    "their", "what", "so", "up", "out", "if", "about", "who", "get", "which", "go", "me", "when", "make", "can", "like", "time", "no",
+    "just", "him", "know", "take", "people", "into", "year", "your", "good", "some", "could", "them", "see", "other", "than", "then",
+    "now", "look", "only", "come", "its", "over", "think", "also", "back", "after", "use", "two", "how", "our", "work", "first", "well",
+    "way", "even", "new", "want", "because", "any", "these", "give", "day", "most", "us",
+)
+
 """
 END OF CONSTANTS
 """
@@ -0,0 +1,170 @@
+import warnings
+from functools import lru_cache
+import numpy as np
+
+from .constants import ALPHABET_LOWER, ALPHABET_UPPER, ALPHABET_LOWER_REVERSE
+from .utils.base_cipher import BaseCipher
+from .utils import general_utils, math_utils
+from .stats import LETTER_CODES, NOT_A_LETTER
+from . import reference
+
+"""
+Table-driven and vectorized cipher implementations
+
+Drop-in replacements for the reference classes with the same methods and output. They work on ASCII text;
+any other input (or unusual key) is handed to the reference implementation, so results always match it.
+"""
+
+@lru_cache(maxsize=1024)
+def shiftTable(shift: int) -> dict:
+    """
+    Returns a str.translate table shifting letters by shift positions, preserving case
+    """
+    return str.maketrans(ALPHABET_LOWER + ALPHABET_UPPER, ALPHABET_LOWER[shift:] + ALPHABET_LOWER[:shift] + ALPHABET_UPPER[shift:] + ALPHABET_UPPER[:shift])
+
+@lru_cache(maxsize=1024)
+def affineTable(a: int, b: int) -> dict:
+    """
+    Returns a str.translate table mapping letter index i to (a * i + b) % 26, preserving case
+    """
+    indices = [(a * i + b) % 26 for i in range(26)]
+    return str.maketrans(ALPHABET_LOWER + ALPHABET_UPPER, "".join(ALPHABET_LOWER[i] for i in indices) + "".join(ALPHABET_UPPER[i] for i in indices))
+
+def shiftLetters(message: str, shifts) -> str:
+    """
+    Shifts the n-th letter of an ASCII message by shifts[n] positions, preserving case and leaving every other character in place
+    """
+    data = np.frombuffer(message.encode("ascii"), dtype=np.uint8).copy()
+    codes = LETTER_CODES[data]
+    positions = np.flatnonzero(codes != NOT_A_LETTER)
+    base = np.where(data[positions] >= ord("a"), ord("a"), ord("A"))
+    data[positions] = (codes[positions] + np.asarray(shifts)[:len(positions)]) % 26 + base
+    return data.tobytes().decode("ascii")
+
+def countLetters(message: str) -> int:
+    return int(np.count_nonzero(LETTER_CODES[np.frombuffer(message.encode("ascii"), dtype=np.uint8)] != NOT_A_LETTER))
+
+# CAESAR CIPHER
+class CaesarCipher(BaseCipher):
+    def encrypt(self, message, key, decrypt=1):
+        if not message.isascii() or not isinstance(key, int):
+            return reference.CaesarCipher().encrypt(message, key, decrypt)
+        return message.translate(shiftTable(decrypt * key % 26))
+
+    def decrypt(self, message, key):
+        return self.encrypt(message, key, decrypt=-1)
+
+
+# ROT13 CIPHER
+class ROT13Cipher(CaesarCipher):
+    def encrypt(self, message):
+        return CaesarCipher().encrypt(message, 13)
+
+    def decrypt(self, message):
+        return CaesarCipher().decrypt(message, 13)
+
+
+# MONOALPHABETIC CIPHER
+class MonoalphabeticCipher(BaseCipher):
+    def encrypt(self, message, key, decrypt=1):
+        if not message.isascii():
+            return reference.MonoalphabeticCipher().encrypt(message, key, decrypt)
+        key = key.upper()
+        alphabet1, alphabet2 = (ALPHABET_UPPER, key)[::decrypt]
+        table = {}
+        for a, b in general_utils.generateTranslationTable(alphabet1, alphabet2).items():
+            if chr(a) in ALPHABET_UPPER:
+                table[a] = b
+                table[ord(chr(a).lower())] = ord(chr(b).lower())
+        return message.translate(table)
+
+    def decrypt(self, message, key):
+        return self.encrypt(message, key, decrypt=-1)
+
+
+# ATBASH CIPHER
+class AtbashCipher(BaseCipher):
+    def encrypt(self, message):
+        return MonoalphabeticCipher().encrypt(message, ALPHABET_LOWER_REVERSE)
+
+    def decrypt(self, message):
+        return self.encrypt(message)
+
+
+# AFFINE CIPHER
+class AffineCipher(BaseCipher):
+    def encrypt(self, message, a, b, decrypt=1):
+        if not message.isascii() or not isinstance(a, int) or not isinstance(b, int):
+            return reference.AffineCipher().encrypt(message, a, b, decrypt)
+        gcd, x, y = math_utils.extendedEuclidean(a, 26)
+        if gcd != 1:
+            warnings.warn("Modular inverse does not exist!")
+            return None
+        aInv = x % 26
+        table = affineTable(a % 26, b % 26) if decrypt == 1 else affineTable(aInv, (-aInv * b) % 26)
+        return message.translate(table)
+
+    def decrypt(self, message, a, b):
+        return self.encrypt(message, a, b, decrypt=-1)
+
+
+# VIGENERE CIPHER
+class VigenereCipher(BaseCipher):
+    def encrypt(self, message, key, decrypt=1):
+        if not message.isascii() or not key or not all(char in ALPHABET_LOWER + ALPHABET_UPPER for char in key):
+            return reference.VigenereCipher().encrypt(message, key, decrypt)
+        keyShifts = np.array(general_utils.encodeToAlphabetIndices(key))
+        return shiftLetters(message, decrypt * np.resize(keyShifts, countLetters(message)))
+
+    def decrypt(self, message, key):
+        return self.encrypt(message, key, decrypt=-1)
+
+
+# TRITHEMIUS CIPHER
+class TrithemiusCipher(BaseCipher):
+    def encrypt(self, message, ascending=True, initial_shift=0):
+        if not message.isascii() or not isinstance(initial_shift, int):
+            return reference.TrithemiusCipher().encrypt(message, ascending, initial_shift)
+        shifts = np.arange(countLetters(message)) + initial_shift
+        return shiftLetters(message, shifts if ascending else -shifts)
+
+    def decrypt(self, message, ascending=True, initial_shift=0):
+        return self.encrypt(message, not ascending, initial_shift)
+
+
+# TRANSPOSITION CIPHER
+class TranspositionCipher(BaseCipher):
+    def encrypt(self, message, key, decrypt=1):
+        if not message.isascii() or not key or (decrypt == -1 and len(message) % len(key) != 0):
+            return reference.TranspositionCipher().encrypt(message, key, decrypt)
+        order = sorted(range(len(key)), key=lambda x: key[x])
+        if decrypt == 1:
+            message += "X" * (-len(message) % len(key))
+        data = np.frombuffer(message.encode("ascii"), dtype=np.uint8)
+        if decrypt == 1:
+            result = data.reshape(-1, len(key))[:, order].T
+        else:
+            result = data.reshape(len(key), -1).T[:, [order.index(i) for i in range(len(key))]]
+        return np.ascontiguousarray(result).tobytes().decode("ascii")
+
+    def decrypt(self, message, key):
+        return self.encrypt(message, key, decrypt=-1)
+
+
+# Fast implementation of each cipher, by registry name. Ciphers without one (Hill, Playfair) use the reference class.
+FAST_CIPHERS = {
+    "caesar": CaesarCipher,
+    "rot13": ROT13Cipher,
+    "trithemius": TrithemiusCipher,
+    "atbash": AtbashCipher,
+    "monoalphabetic": MonoalphabeticCipher,
+    "vigenere": VigenereCipher,
+    "transposition": TranspositionCipher,
+    "affine": AffineCipher,
+    "hill": reference.HillCipher,
+    "playfair": reference.PlayfairCipher,
+}
+
+"""
+End of table-driven and vectorized cipher implementations
+"""
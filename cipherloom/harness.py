@@ -0,0 +1,170 @@
+import argparse
+import random
+import time
+import warnings
+
+from .constants import ALPHABET_LOWER, ALPHABET_UPPER, PUNCTUATION
+from .fast import FAST_CIPHERS
+from .reference import REFERENCE_CIPHERS
+from .utils import math_utils
+
+"""
+Differential testing of fast paths against the reference implementations
+"""
+
+def randomMessage(rng: random.Random, length: int) -> str:
+    """
+    Generates a message of the given length mixing upper and lower case letters, the PUNCTUATION characters and doubled letters
+    """
+    chars = []
+    while len(chars) < length:
+        roll = rng.random()
+        if roll < 0.2:
+            chars.append(rng.choice(PUNCTUATION))
+        elif roll < 0.3:
+            chars.extend(rng.choice(ALPHABET_LOWER + ALPHABET_UPPER) * 2)
+        else:
+            chars.append(rng.choice(ALPHABET_LOWER + ALPHABET_UPPER))
+    return "".join(chars[:length])
+
+def randomLetters(rng: random.Random, length: int) -> str:
+    return "".join(rng.choice(ALPHABET_LOWER + ALPHABET_UPPER) for _ in range(length))
+
+def randomKey(rng: random.Random, cipherName: str) -> tuple:
+    """
+    Generates random arguments for a cipher's encrypt/decrypt methods
+    """
+    if cipherName == "caesar":
+        return (rng.randint(-40, 40),)
+    if cipherName == "affine":
+        return (rng.choice([a for a in range(1, 52) if math_utils.extendedEuclidean(a, 26)[0] == 1]), rng.randint(-30, 30))
+    if cipherName == "monoalphabetic":
+        return ("".join(rng.sample(ALPHABET_LOWER if rng.random() < 0.5 else ALPHABET_UPPER, 26)),)
+    if cipherName == "vigenere":
+        return (randomLetters(rng, rng.randint(1, 9)),)
+    if cipherName == "trithemius":
+        return (rng.random() < 0.5, rng.randint(0, 40))
+    if cipherName == "transposition":
+        return (randomLetters(rng, rng.randint(2, 9)).lower(),)
+    if cipherName == "hill":
+        while True:
+            key = "".join(rng.choice(ALPHABET_LOWER) for _ in range(rng.choice([4, 9])))
+            matrix = math_utils.toSquareMatrix([ALPHABET_LOWER.index(char) for char in key], oneDim = True).tolist()
+            if math_utils.isMatrixInvertibleModN(matrix, 26):
+                return (key,)
+    if cipherName == "playfair":
+        return (randomLetters(rng, rng.randint(0, 10)),)
+    return ()
+
+def runSafely(function, *args):
+    """
+    Returns ("ok", result) or ("error", exception type name), so that errors can be compared as outputs too
+    """
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            return ("ok", function(*args))
+    except Exception as error:
+        return ("error", type(error).__name__)
+
+def checkCipher(cipherName: str, size: int, trials: int, rng: random.Random) -> list[dict]:
+    """
+    Encrypts and decrypts random messages of the given size with both implementations and returns every mismatch
+    """
+    referenceCipher, fastCipher = REFERENCE_CIPHERS[cipherName](), FAST_CIPHERS[cipherName]()
+    mismatches = []
+    for _ in range(trials):
+        message, args = randomMessage(rng, size), randomKey(rng, cipherName)
+        status, encrypted = runSafely(referenceCipher.encrypt, message, *args)
+        inputs = [("encrypt", message, (status, encrypted))]
+        if status == "ok" and encrypted is not None:
+            inputs.append(("decrypt", encrypted, runSafely(referenceCipher.decrypt, encrypted, *args)))
+        for mode, text, expected in inputs:
+            actual = runSafely(getattr(fastCipher, mode), text, *args)
+            if actual != expected:
+                mismatches.append({"cipher": cipherName, "mode": mode, "message": text, "args": args, "reference": expected, "fast": actual})
+    return mismatches
+
+def timeCipher(cipher, messages: list[str], args: list[tuple]) -> float:
+    """
+    Returns the seconds taken to encrypt every message with its arguments. The inputs must be valid (see timingInputs).
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        start = time.perf_counter()
+        for message, messageArgs in zip(messages, args):
+            cipher.encrypt(message, *messageArgs)
+        return time.perf_counter() - start
+
+def timingInputs(cipherName: str, messages: list[str], args: list[tuple]) -> tuple[list[str], list[tuple]]:
+    """
+    Keeps the (message, arguments) pairs both implementations encrypt without an error, so only real work is timed
+    """
+    ciphers = REFERENCE_CIPHERS[cipherName](), FAST_CIPHERS[cipherName]()
+    valid = [(message, messageArgs) for message, messageArgs in zip(messages, args)
+             if all((result := runSafely(cipher.encrypt, message, *messageArgs))[0] == "ok" and result[1] is not None for cipher in ciphers)]
+    return [message for message, _ in valid], [messageArgs for _, messageArgs in valid]
+
+def runHarness(ciphers = None, sizes = (16, 255, 4097), trials = 20, seed = 0) -> list[dict]:
+    """
+    Checks every cipher's fast path against the reference implementation on random messages of each size and measures both.
+    Returns one report row per cipher and size with the number of trials, mismatches found and the speedup of the fast path.
+    Timing only uses the random inputs both implementations accept; "timed" counts them.
+    """
+    rng = random.Random(seed)
+    report = []
+    for cipherName in ciphers or list(REFERENCE_CIPHERS):
+        for size in sizes:
+            mismatches = checkCipher(cipherName, size, trials, rng)
+            messages = [randomMessage(rng, size) for _ in range(trials)]
+            args = [randomKey(rng, cipherName) for _ in range(trials)]
+            messages, args = timingInputs(cipherName, messages, args)
+            referenceTime = timeCipher(REFERENCE_CIPHERS[cipherName](), messages, args)
+            fastTime = timeCipher(FAST_CIPHERS[cipherName](), messages, args)
+            report.append({
+                "cipher": cipherName,
+                "size": size,
+                "trials": trials,
+                "fastPath": FAST_CIPHERS[cipherName] is not REFERENCE_CIPHERS[cipherName],
+                "mismatches": mismatches,
+                "timed": len(messages),
+                "referenceSeconds": referenceTime,
+                "fastSeconds": fastTime,
+                "speedup": referenceTime / fastTime if fastTime > 0 else float("nan"),
+            })
+    return report
+
+def formatReport(report: list[dict]) -> str:
+    lines = [f"{'cipher':<16}{'size':>8}{'trials':>8}{'mismatches':>12}{'timed':>8}{'reference MB/s':>16}{'fast MB/s':>12}{'speedup':>10}"]
+    for row in report:
+        processed = row["size"] * row["timed"] / 1e6
+        referenceRate = f"{processed / row['referenceSeconds']:.3f}" if row["timed"] and row["referenceSeconds"] else "n/a"
+        fastRate = f"{processed / row['fastSeconds']:.3f}" if row["timed"] and row["fastSeconds"] else "n/a"
+        speedup = f"{row['speedup']:.1f}x" if row["fastPath"] and row["timed"] and row["fastSeconds"] else "n/a"
+        lines.append(f"{row['cipher']:<16}{row['size']:>8}{row['trials']:>8}{len(row['mismatches']):>12}{row['timed']:>8}{referenceRate:>16}{fastRate:>12}{speedup:>10}")
+    return "\n".join(lines)
+
+def main(argv = None) -> int:
+    parser = argparse.ArgumentParser(prog="cipherloom.harness", description="Check fast cipher paths against the reference implementations.")
+    parser.add_argument("ciphers", nargs="*", help=f"Ciphers to check (default: all). Choose from: {', '.join(REFERENCE_CIPHERS)}")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 255, 4097], help="Message lengths to test")
+    parser.add_argument("--trials", type=int, default=20, help="Random messages per cipher and size")
+    parser.add_argument("--seed", type=int, default=0)
+    options = parser.parse_args(argv)
+    unknown = [name for name in options.ciphers if name not in REFERENCE_CIPHERS]
+    if unknown:
+        parser.error(f"Unknown cipher(s): {', '.join(unknown)}")
+    report = runHarness(options.ciphers or None, options.sizes, options.trials, options.seed)
+    print(formatReport(report))
+    for row in report:
+        for mismatch in row["mismatches"][:3]:
+            print(f"MISMATCH {mismatch['cipher']} {mismatch['mode']} args={mismatch['args']!r} message={mismatch['message']!r}")
+            print(f"  reference: {mismatch['reference']!r}\n  fast:      {mismatch['fast']!r}")
+    return 1 if any(row["mismatches"] for row in report) else 0
+
+"""
+End of differential testing of fast paths against the reference implementations
+"""
+
+if __name__ == "__main__":
+    raise SystemExit(main())
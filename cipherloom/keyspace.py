@@ -0,0 +1,165 @@
+import math
+from abc import ABC, abstractmethod
+
+from .constants import ALPHABET_UPPER
+from .utils import math_utils
+from .utils.general_utils import encodeToAlphabetIndices
+
+"""
+Key spaces
+"""
+
+class KeySpace(ABC):
+    """
+    A cipher's key space, numbered from 0 to size - 1 so it can be iterated lazily and split into disjoint slices for parallel workers.
+    Some numbers may map to keys that are not valid for the cipher (e.g. a Hill matrix that is not invertible); iteration skips those.
+    """
+    size = 0
+
+    @abstractmethod
+    def keyAt(self, index: int):
+        """
+        Returns the key numbered index (which may not be valid)
+        """
+
+    @abstractmethod
+    def indexOf(self, key) -> int:
+        """
+        Returns the number of a key
+        """
+
+    def isValid(self, key) -> bool:
+        return True
+
+    def iterRange(self, start: int, stop: int):
+        """
+        Yields the valid keys numbered start to stop - 1
+        """
+        for index in range(max(start, 0), min(stop, self.size)):
+            key = self.keyAt(index)
+            if self.isValid(key):
+                yield key
+
+    def __iter__(self):
+        return self.iterRange(0, self.size)
+
+    def slice(self, start: int, stop: int):
+        return KeySlice(self, start, stop)
+
+    def shard(self, shard_index: int, shard_count: int):
+        """
+        Returns slice shard_index of shard_count disjoint, contiguous slices that together cover the key space
+        """
+        if not 0 <= shard_index < shard_count:
+            raise ValueError("shard_index must be between 0 and shard_count - 1")
+        return self.slice(self.size * shard_index // shard_count, self.size * (shard_index + 1) // shard_count)
+
+class KeySlice:
+    """
+    Keys numbered start to stop - 1 of a key space
+    """
+    def __init__(self, space: KeySpace, start: int, stop: int):
+        self.space = space
+        self.start = start
+        self.stop = stop
+
+    def __iter__(self):
+        return self.space.iterRange(self.start, self.stop)
+
+    def __repr__(self):
+        return f"KeySlice({type(self.space).__name__}, {self.start}, {self.stop})"
+
+class CaesarKeySpace(KeySpace):
+    """
+    Caesar shifts 0 to 25
+    """
+    size = 26
+
+    def keyAt(self, index):
+        return index
+
+    def indexOf(self, key):
+        return key % 26
+
+class AffineKeySpace(KeySpace):
+    """
+    Affine keys (a, b), valid when a is coprime with 26
+    """
+    size = 26 * 26
+
+    def keyAt(self, index):
+        return divmod(index, 26)
+
+    def indexOf(self, key):
+        a, b = key
+        return (a % 26) * 26 + b % 26
+
+    def isValid(self, key):
+        return math_utils.extendedEuclidean(key[0], 26)[0] == 1
+
+class VigenereKeySpace(KeySpace):
+    """
+    Every Vigenère key of key_length uppercase letters, in alphabetical order
+    """
+    def __init__(self, key_length: int):
+        self.key_length = key_length
+        self.size = 26 ** key_length
+
+    def keyAt(self, index):
+        letters = []
+        for _ in range(self.key_length):
+            index, i = divmod(index, 26)
+            letters.append(ALPHABET_UPPER[i])
+        return "".join(reversed(letters))
+
+    def indexOf(self, key):
+        index = 0
+        for i in encodeToAlphabetIndices(key):
+            index = index * 26 + i
+        return index
+
+class HillKeySpace(KeySpace):
+    """
+    Hill keys of size x size letters (row-major key strings, as HillCipher takes them), valid when the key matrix is invertible mod 26
+    """
+    def __init__(self, size: int):
+        self.matrixSize = size
+        self.vigenere = VigenereKeySpace(size * size)
+        self.size = self.vigenere.size
+
+    def keyAt(self, index):
+        return self.vigenere.keyAt(index).lower()
+
+    def indexOf(self, key):
+        return self.vigenere.indexOf(key)
+
+    def isValid(self, key):
+        matrix = math_utils.toSquareMatrix(encodeToAlphabetIndices(key), oneDim = True).tolist()
+        return math_utils.isMatrixInvertibleModN(matrix, 26)
+
+class TranspositionKeySpace(KeySpace):
+    """
+    Column orders of a columnar transposition key of key_length columns, as tuples of column ranks in lexicographic order
+    """
+    def __init__(self, key_length: int):
+        self.key_length = key_length
+        self.size = math.factorial(key_length)
+
+    def keyAt(self, index):
+        # Decode the index in the factorial number system (Lehmer code)
+        remaining, key = list(range(self.key_length)), []
+        for position in range(self.key_length - 1, -1, -1):
+            digit, index = divmod(index, math.factorial(position))
+            key.append(remaining.pop(digit))
+        return tuple(key)
+
+    def indexOf(self, key):
+        remaining, index = sorted(key), 0
+        for position, rank in enumerate(key):
+            index += remaining.index(rank) * math.factorial(len(key) - 1 - position)
+            remaining.remove(rank)
+        return index
+
+"""
+End of key spaces
+"""
@@ -0,0 +1,181 @@
+import math
+import numpy as np
+
+from .constants import ALPHABET_LOWER, ENGLISH_BIGRAM_FREQUENCIES, COMMON_ENGLISH_WORDS
+from .stats import encodeLetterCodes
+
+"""
+Dictionary trie
+"""
+
+def buildTrie(words) -> dict:
+    """
+    Builds a trie of nested dictionaries from a collection of words. The key None marks the end of a word.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word.lower():
+            node = node.setdefault(char, {})
+        node[None] = True
+    return trie
+
+def longestWordAt(trie: dict, letters: str, start: int) -> int:
+    """
+    Returns the length of the longest word in the trie that starts at letters[start], or 0 if there is none
+    """
+    node, longest = trie, 0
+    for i in range(start, len(letters)):
+        node = node.get(letters[i])
+        if node is None:
+            break
+        if None in node:
+            longest = i - start + 1
+    return longest
+
+"""
+End of dictionary trie
+"""
+
+"""
+Plaintext recognizer
+"""
+
+def englishBigramLogProbabilities() -> np.ndarray:
+    """
+    Returns log10 bigram probabilities indexed by packed bigram code, from ENGLISH_BIGRAM_FREQUENCIES.
+    The probability mass not covered by the listed bigrams is spread evenly over the remaining ones.
+    """
+    listed = {ALPHABET_LOWER.index(a) * 26 + ALPHABET_LOWER.index(b): f / 100 for (a, b), f in ENGLISH_BIGRAM_FREQUENCIES.items()}
+    remaining = (1 - sum(listed.values())) / (26 ** 2 - len(listed))
+    probabilities = np.full(26 ** 2, remaining)
+    probabilities[list(listed)] = list(listed.values())
+    return np.log10(probabilities)
+
+class PlaintextRecognizer:
+    """
+    Scores how much a candidate decryption looks like English, combining bigram fitness with a bonus for each letter covered by a dictionary word.
+    Candidates are scored from a stream of plaintext chunks, and scoring stops (and decryption with it) if an upper bound on the final
+    score shows the candidate cannot reach a threshold, e.g. the k-th best score found so far. The default bound is exact, so results never
+    change, but it allows every unscored letter its best bigram and a full word bonus and so only cuts candidates off near their end:
+    a brute force search still scores 85-99% of the letters of English test texts. Scoring substantially fewer letters needs the lossy
+    `confidence` bound.
+
+    :param bigram_log_probabilities: log10 bigram probabilities indexed by packed bigram code. Defaults to English.
+    :param words: Dictionary words; words shorter than min_word_length are ignored. Defaults to COMMON_ENGLISH_WORDS.
+    :param word_bonus: Score added for each letter that is part of a dictionary word. Defaults to 1.
+    :param min_word_length: Shortest word counted as a match. Defaults to 3.
+    :param confidence: Opt-in statistical early abort: once min_prefix letters are scored, the rest of the candidate is assumed to score
+                       at most its observed per-letter rate plus `confidence` standard errors (e.g. 4). This aborts far earlier than the exact
+                       bound (which only uses the best possible score of each remaining letter), but is lossy: a plaintext whose start does not
+                       look like English (a noisy header, a table) can be dropped. Defaults to None, the exact bound only, which never changes results.
+    :param min_prefix: Letters to score before the statistical bound is used. Defaults to 48.
+    """
+    def __init__(self, bigram_log_probabilities = None, words = COMMON_ENGLISH_WORDS, word_bonus = 1.0, min_word_length = 3, confidence = None, min_prefix = 48):
+        self.bigramLogProbabilities = englishBigramLogProbabilities() if bigram_log_probabilities is None else np.asarray(bigram_log_probabilities, dtype=float)
+        self.trie = buildTrie(word for word in words if len(word) >= min_word_length)
+        self.maxWordLength = max((len(word) for word in words), default=0)
+        self.word_bonus = word_bonus
+        self.min_word_length = min_word_length
+        self.confidence = confidence
+        self.min_prefix = min_prefix
+        # Best score any letter can contribute, given the letter: the most likely bigram ending in it plus the word bonus
+        self.letterBounds = self.bigramLogProbabilities.reshape(26, 26).max(axis=0) + word_bonus
+        self.lettersScored = 0
+
+    @classmethod
+    def fromAccumulator(cls, accumulator, **kwargs):
+        """
+        Builds a recognizer whose bigram model is trained on the counts of a stats.NGramAccumulator (with add-one smoothing)
+        """
+        counts = accumulator.bigrams + 1
+        return cls(bigram_log_probabilities=np.log10(counts / counts.sum()), **kwargs)
+
+    def score(self, chunks, letter_histogram = None, threshold = -math.inf, letter_count = None):
+        """
+        Scores a candidate plaintext given as an iterable of chunks, reading only as many chunks as needed.
+
+        :param chunks: Iterable of plaintext chunks. Non-alphabetical characters are ignored.
+        :param letter_histogram: Count of each letter (a-z) in the whole candidate, which is usually known without decrypting it
+                                 (e.g. the shifted ciphertext counts for a Caesar key).
+        :param threshold: Score the candidate has to exceed to be of interest.
+        :param letter_count: Number of letters in the whole candidate, for when the histogram is not known (e.g. a Hill decryption).
+                             Without either the candidate cannot be abandoned early.
+        :return: The score, or None if the candidate was abandoned because it cannot exceed the threshold.
+        """
+        remaining = None if letter_histogram is None else np.array(letter_histogram, dtype=np.int64)
+        if remaining is None and letter_count is not None:
+            # Without the histogram every remaining letter is bounded by the best-scoring letter
+            remaining = np.zeros(26, dtype=np.int64)
+            remaining[self.letterBounds.argmax()] = letter_count
+        ngramScore, ngramSquares, scoredLetters, coveredLetters, settledLetters = 0.0, 0.0, 0, 0, 0
+        previous = None
+        buffer, coveredUntil = "", 0
+        for chunk in chunks:
+            newCodes = encodeLetterCodes(chunk)
+            if len(newCodes) == 0:
+                continue
+            self.lettersScored += len(newCodes)
+            codes = newCodes if previous is None else np.concatenate(([previous], newCodes))
+            bigramScores = self.bigramLogProbabilities[codes[:-1] * 26 + codes[1:]]
+            ngramScore += bigramScores.sum()
+            ngramSquares += (bigramScores ** 2).sum()
+            scoredLetters += len(bigramScores)
+            previous = newCodes[-1]
+
+            buffer += (newCodes + ord("a")).astype(np.uint8).tobytes().decode("ascii")
+            scanned, coveredUntil, covered = self._scanWords(buffer, coveredUntil, final=False)
+            coveredLetters += covered
+            settledLetters += scanned
+            buffer, coveredUntil = buffer[scanned:], max(coveredUntil - scanned, 0)
+
+            if remaining is not None:
+                if letter_histogram is None:
+                    remaining[self.letterBounds.argmax()] -= len(newCodes)
+                else:
+                    remaining -= np.bincount(newCodes, minlength=26)
+                bound = ngramScore + (coveredLetters + len(buffer)) * self.word_bonus + remaining @ self.letterBounds
+                if self.confidence is not None and settledLetters >= self.min_prefix:
+                    bound = min(bound, self._statisticalBound(ngramScore, ngramSquares, scoredLetters, coveredLetters, settledLetters,
+                                                              len(buffer) + remaining.sum()))
+                if bound <= threshold:
+                    return None
+        _, _, covered = self._scanWords(buffer, coveredUntil, final=True)
+        return float(ngramScore + (coveredLetters + covered) * self.word_bonus)
+
+    def _statisticalBound(self, ngramScore, ngramSquares, scoredLetters, coveredLetters, settledLetters, unscoredLetters) -> float:
+        """
+        Estimates the best final score a candidate can still reach, assuming its unscored letters score like the ones seen so far
+        """
+        ngramRate = ngramScore / scoredLetters
+        ngramDeviation = math.sqrt(max(ngramSquares / scoredLetters - ngramRate ** 2, 0))
+        coverage = coveredLetters / settledLetters
+        deviation = ngramDeviation + self.word_bonus * math.sqrt(coverage * (1 - coverage))
+        rate = ngramRate + self.word_bonus * coverage + self.confidence * deviation / math.sqrt(settledLetters)
+        return ngramScore + coveredLetters * self.word_bonus + unscoredLetters * rate
+
+    def _scanWords(self, letters: str, coveredUntil: int, final: bool) -> tuple[int, int, int]:
+        """
+        Looks for dictionary words starting at each position of letters whose coverage is settled
+        (every word that could start there fits in letters, or there are no more letters to come).
+        Returns the number of positions settled, the new end of the covered span and how many settled positions are covered.
+        """
+        settled = len(letters) if final else max(len(letters) - self.maxWordLength + 1, 0)
+        covered = 0
+        for start in range(settled):
+            length = longestWordAt(self.trie, letters, start)
+            if length >= self.min_word_length:
+                coveredUntil = max(coveredUntil, start + length)
+            if start < coveredUntil:
+                covered += 1
+        return settled, coveredUntil, covered
+
+    def scoreText(self, text: str) -> float:
+        """
+        Scores a complete candidate plaintext
+        """
+        return self.score([text])
+
+"""
+End of plaintext recognizer
+"""
@@ -0,0 +1,16 @@
+from .substitution_ciphers import CaesarCipher, ROT13Cipher, MonoalphabeticCipher, AtbashCipher, AffineCipher
+from .polyalphabetic_ciphers import VigenereCipher, TrithemiusCipher
+from .transposition_ciphers import TranspositionCipher
+from .polygraphic_ciphers import HillCipher, PlayfairCipher
+from .registry import CIPHERS as REFERENCE_CIPHERS
+
+"""
+Reference implementations
+
+The original pure-Python cipher classes, kept importable under one name so optimized code paths (see cipherloom.fast)
+can be checked against them, e.g. with cipherloom.harness.
+"""
+
+"""
+End of reference implementations
+"""
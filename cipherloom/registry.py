@@ -0,0 +1,93 @@
+import math
+
+from .substitution_ciphers import CaesarCipher, ROT13Cipher, MonoalphabeticCipher, AtbashCipher, AffineCipher
+from .polyalphabetic_ciphers import VigenereCipher, TrithemiusCipher
+from .transposition_ciphers import TranspositionCipher
+from .polygraphic_ciphers import HillCipher, PlayfairCipher
+from .utils import math_utils
+from .utils.general_utils import encodeToAlphabetIndices
+
+"""
+Cipher registry
+"""
+
+CIPHERS = {
+    "caesar": CaesarCipher,
+    "rot13": ROT13Cipher,
+    "trithemius": TrithemiusCipher,
+    "atbash": AtbashCipher,
+    "monoalphabetic": MonoalphabeticCipher,
+    "vigenere": VigenereCipher,
+    "transposition": TranspositionCipher,
+    "affine": AffineCipher,
+    "hill": HillCipher,
+    "playfair": PlayfairCipher,
+}
+
+# Ciphers that map every character of a message independently of the rest of it (up to its position among the letters),
+# so a message can be split anywhere and the pieces processed separately
+SEGMENTABLE_CIPHERS = {"caesar", "rot13", "trithemius", "atbash", "monoalphabetic", "vigenere", "affine"}
+
+# Segmentable ciphers whose output also depends on the position of each letter in the message
+POSITIONAL_CIPHERS = {"trithemius", "vigenere"}
+
+def getCipher(name: str):
+    """
+    Returns an instance of the cipher registered under name
+    """
+    if name not in CIPHERS:
+        raise ValueError(f"Unknown cipher '{name}'. Choose from: {', '.join(CIPHERS)}")
+    return CIPHERS[name]()
+
+def parseKey(name: str, key) -> tuple:
+    """
+    Converts a key given as a string (e.g. on the command line) to the positional arguments of the cipher's encrypt/decrypt methods
+
+    caesar: shift (e.g. "3"), affine: "a,b" (e.g. "5,8"), trithemius: optional initial shift and direction (e.g. "4" or "4,desc"),
+    rot13/atbash: no key, every other cipher: the key string itself
+
+    Keys the cipher cannot use (an affine a not coprime with 26, a Hill key that is not an invertible square matrix) raise ValueError.
+    """
+    getCipher(name)
+    if name in ("rot13", "atbash"):
+        return ()
+    if key is None or key == "":
+        if name == "trithemius":
+            return (True, 0)
+        raise ValueError(f"The {name} cipher requires a key")
+    if name == "caesar":
+        return (int(key),)
+    if name == "affine":
+        a, b = key.split(",")
+        if math_utils.extendedEuclidean(int(a), 26)[0] != 1:
+            raise ValueError(f"Affine key a={a} must be coprime with 26")
+        return (int(a), int(b))
+    if name == "trithemius":
+        shift, _, direction = key.partition(",")
+        if direction not in ("", "asc", "desc"):
+            raise ValueError("Trithemius direction must be 'asc' or 'desc'")
+        return (direction != "desc", int(shift or 0))
+    if name == "hill":
+        size = math.isqrt(len(key))
+        if not (key.isascii() and key.isalpha()) or size * size != len(key):
+            raise ValueError("Hill key must be a square number of letters")
+        if not math_utils.isMatrixInvertibleModN(math_utils.toSquareMatrix(encodeToAlphabetIndices(key), oneDim = True).tolist(), 26):
+            raise ValueError(f"Hill key '{key}' is not invertible mod 26")
+    return (key,)
+
+def offsetArgs(name: str, args: tuple, offset: int) -> tuple:
+    """
+    Returns the arguments that make a positional cipher process a segment as if it were preceded by offset letters
+    """
+    if name == "vigenere":
+        key = args[0]
+        shift = offset % len(key)
+        return (key[shift:] + key[:shift],)
+    if name == "trithemius":
+        ascending, initialShift = args
+        return (ascending, initialShift + offset)
+    return args
+
+"""
+End of cipher registry
+"""
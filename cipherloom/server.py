@@ -0,0 +1,303 @@
+import argparse
+import asyncio
+import json
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from .registry import getCipher, parseKey
+
+"""
+Micro-batching encryption service
+"""
+
+def runBatch(mode: str, cipherName: str, args: tuple, messages: list[str]) -> list:
+    """
+    Encrypts or decrypts a batch of messages sharing the same cipher and key. Runs on the worker executor.
+    Returns one result per message: the processed text, or the exception raised for it.
+    """
+    cipher = getCipher(cipherName)
+    function = cipher.decrypt if mode == "decrypt" else cipher.encrypt
+    results = []
+    for message in messages:
+        try:
+            result = function(message, *args)
+            results.append(result if result is not None else ValueError(f"{cipherName} could not process the message with the given key"))
+        except Exception as error:
+            results.append(error)
+    return results
+
+class BatchingCipherService:
+    """
+    Groups concurrent requests with the same mode, cipher and key into batches and runs each batch as a single executor job.
+    A batch is dispatched when it reaches max_batch_size requests or max_delay seconds after its first request arrived.
+
+    :param max_delay: Latency window in seconds a request may wait for others to join its batch. Defaults to 5 ms.
+    :param max_batch_size: Largest number of requests in one batch. Defaults to 64.
+    :param executor: Executor batches run on. Defaults to the event loop's default executor.
+    """
+    def __init__(self, max_delay = 0.005, max_batch_size = 64, executor = None):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.max_delay = max_delay
+        self.max_batch_size = max_batch_size
+        self.executor = executor
+        self._pending = {}
+        self._timers = {}
+        self._tasks = set()
+        self._queueDepth = 0
+        self._inFlight = 0
+        self._requestCount = 0
+        self._batchSizes = Counter()
+
+    async def submit(self, mode: str, cipherName: str, args: tuple, message: str) -> str:
+        """
+        Queues a message for encryption or decryption and returns the result once its batch has run
+        """
+        if mode not in ("encrypt", "decrypt"):
+            raise ValueError("mode must be 'encrypt' or 'decrypt'")
+        getCipher(cipherName)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batchKey = (mode, cipherName, tuple(args))
+        batch = self._pending.setdefault(batchKey, [])
+        batch.append((message, future))
+        self._queueDepth += 1
+        self._requestCount += 1
+        if len(batch) >= self.max_batch_size:
+            self._dispatch(batchKey)
+        elif len(batch) == 1:
+            self._timers[batchKey] = loop.call_later(self.max_delay, self._dispatch, batchKey)
+        return await future
+
+    def _dispatch(self, batchKey):
+        """
+        Removes a pending batch and schedules it on the executor
+        """
+        timer = self._timers.pop(batchKey, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(batchKey, None)
+        if not batch:
+            return
+        self._queueDepth -= len(batch)
+        self._inFlight += len(batch)
+        self._batchSizes[len(batch)] += 1
+        task = asyncio.get_running_loop().create_task(self._runBatch(batchKey, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _runBatch(self, batchKey, batch):
+        mode, cipherName, args = batchKey
+        messages = [message for message, _ in batch]
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(self.executor, runBatch, mode, cipherName, args, messages)
+        except Exception as error:
+            results = [error] * len(batch)
+        finally:
+            self._inFlight -= len(batch)
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def flush(self):
+        """
+        Dispatches every pending batch immediately and waits for all running batches to finish
+        """
+        for batchKey in list(self._pending):
+            self._dispatch(batchKey)
+        if self._tasks:
+            await asyncio.gather(*self._tasks)
+
+    def metrics(self) -> dict:
+        """
+        Returns the current queue depth and batching statistics
+        """
+        batchCount = sum(self._batchSizes.values())
+        dispatched = sum(size * count for size, count in self._batchSizes.items())
+        return {
+            "queueDepth": self._queueDepth,
+            "inFlight": self._inFlight,
+            "requests": self._requestCount,
+            "batches": batchCount,
+            "meanBatchSize": dispatched / batchCount if batchCount else 0.0,
+            "maxBatchSize": max(self._batchSizes, default=0),
+            "batchSizes": dict(sorted(self._batchSizes.items())),
+        }
+
+"""
+End of micro-batching encryption service
+"""
+
+"""
+Line-delimited JSON protocol
+"""
+
+DEFAULT_LINE_LIMIT = 16 * 1024 * 1024
+DEFAULT_MAX_PENDING = 256
+KEY_CACHE_SIZE = 1024
+
+class CipherServer:
+    """
+    Serves a BatchingCipherService over TCP with one JSON object per line.
+
+    Requests look like {"id": 1, "mode": "encrypt", "cipher": "caesar", "key": "3", "message": "Hello"}, using the key format of
+    registry.parseKey. Responses echo the id with either a "result" or an "error", and are sent in request order on each connection,
+    even though requests are processed concurrently. {"mode": "metrics"} returns the service metrics.
+    Request lines longer than line_limit bytes are skipped and answered with an error. At most max_pending requests per connection
+    are outstanding: reading pauses until the oldest is answered, so a client that never reads its responses cannot grow the queue.
+    Keys are parsed on the service's executor, since validating a large Hill key takes far too long to run on the event loop.
+    """
+    def __init__(self, service: BatchingCipherService, line_limit = DEFAULT_LINE_LIMIT, max_pending = DEFAULT_MAX_PENDING):
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        self.service = service
+        self.line_limit = line_limit
+        self.max_pending = max_pending
+        self._keys = OrderedDict()
+
+    async def parseRequestKey(self, cipherName, key) -> tuple:
+        """
+        Parses a request key on the service's executor, reusing the KEY_CACHE_SIZE most recently parsed keys
+        """
+        cacheKey = (cipherName, key)
+        if cacheKey in self._keys:
+            self._keys.move_to_end(cacheKey)
+            return self._keys[cacheKey]
+        args = await asyncio.get_running_loop().run_in_executor(self.service.executor, parseKey, cipherName, key)
+        self._keys[cacheKey] = args
+        if len(self._keys) > KEY_CACHE_SIZE:
+            self._keys.popitem(last=False)
+        return args
+
+    async def handleRequest(self, line) -> dict:
+        """
+        Processes one request line and returns the response object
+        """
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object")
+        except ValueError as error:
+            return {"error": f"Invalid request: {error}"}
+        response = {"id": request["id"]} if "id" in request else {}
+        try:
+            if request.get("mode") == "metrics":
+                response["metrics"] = self.service.metrics()
+                return response
+            cipherName = request.get("cipher")
+            args = await self.parseRequestKey(cipherName, request.get("key"))
+            response["result"] = await self.service.submit(request.get("mode"), cipherName, args, request.get("message", ""))
+        except Exception as error:
+            response["error"] = str(error)
+        return response
+
+    async def readLine(self, reader: asyncio.StreamReader):
+        """
+        Returns the next request line (b"" at the end of the stream), or None if the line was longer than the reader's limit.
+        An oversized line is read and discarded up to its newline so the following requests are unaffected.
+        """
+        try:
+            return await reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError as error:
+            return error.partial
+        except asyncio.LimitOverrunError:
+            pass
+        while True:
+            try:
+                await reader.readuntil(b"\n")
+                return None
+            except asyncio.IncompleteReadError:
+                return None
+            except asyncio.LimitOverrunError as error:
+                await reader.readexactly(error.consumed)
+
+    async def handleConnection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Reads requests until the client closes its side, answering them in the order they arrived
+        """
+        loop = asyncio.get_running_loop()
+        responses = asyncio.Queue(maxsize=self.max_pending)
+
+        def cancelQueued():
+            while not responses.empty():
+                task = responses.get_nowait()
+                if task is not None:
+                    task.cancel()
+
+        async def writeResponses():
+            try:
+                while (task := await responses.get()) is not None:
+                    writer.write(json.dumps(await task).encode() + b"\n")
+                    await writer.drain()
+            finally:
+                # If the client went away, cancel the requests that will never be answered; this also wakes a reader waiting for room
+                cancelQueued()
+
+        writerTask = loop.create_task(writeResponses())
+        try:
+            while not writerTask.done():
+                line = await self.readLine(reader)
+                if line is None:
+                    oversized = loop.create_future()
+                    oversized.set_result({"error": f"Request line exceeds the {self.line_limit} byte limit"})
+                    await responses.put(oversized)
+                elif not line:
+                    break
+                elif line.strip() and not writerTask.done():
+                    await responses.put(loop.create_task(self.handleRequest(line)))
+        except ConnectionError:
+            pass
+        finally:
+            if not writerTask.done():
+                await responses.put(None)
+            try:
+                await writerTask
+            except ConnectionError:
+                pass
+            finally:
+                cancelQueued()
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except ConnectionError:
+                    pass
+
+    async def start(self, host = "127.0.0.1", port = 8765) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handleConnection, host, port, limit=self.line_limit)
+
+async def serve(host = "127.0.0.1", port = 8765, max_delay = 0.005, max_batch_size = 64, workers = None, line_limit = DEFAULT_LINE_LIMIT,
+                max_pending = DEFAULT_MAX_PENDING):
+    """
+    Runs the encryption service until cancelled, with batches processed on a pool of worker processes
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        server = await CipherServer(BatchingCipherService(max_delay, max_batch_size, executor), line_limit, max_pending).start(host, port)
+        async with server:
+            await server.serve_forever()
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog="cipherloom.server", description="Serve cipherloom encryption over line-delimited JSON on TCP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-delay", type=float, default=0.005, help="Batching window in seconds")
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Number of worker processes (default: number of CPUs)")
+    parser.add_argument("--line-limit", type=int, default=DEFAULT_LINE_LIMIT, help="Longest accepted request line in bytes")
+    parser.add_argument("--max-pending", type=int, default=DEFAULT_MAX_PENDING, help="Most unanswered requests per connection before reading pauses")
+    options = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(options.host, options.port, options.max_delay, options.max_batch_size, options.workers, options.line_limit,
+                          options.max_pending))
+    except KeyboardInterrupt:
+        pass
+
+"""
+End of line-delimited JSON protocol
+"""
+
+if __name__ == "__main__":
+    main()
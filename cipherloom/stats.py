@@ -0,0 +1,167 @@
+import numpy as np
+
+from .constants import ALPHABET_LOWER, ALPHABET_UPPER
+
+"""
+Letter encoding
+"""
+
+NOT_A_LETTER = 26
+
+LETTER_CODES = np.full(256, NOT_A_LETTER, dtype=np.uint8)
+for index, (lower, upper) in enumerate(zip(ALPHABET_LOWER, ALPHABET_UPPER)):
+    LETTER_CODES[ord(lower)] = LETTER_CODES[ord(upper)] = index
+
+def encodeLetterCodes(chunk) -> np.ndarray:
+    """
+    Converts a chunk of text (str, bytes or any buffer) to an array of alphabet indices (0-25), dropping all non-alphabetical characters
+    """
+    if isinstance(chunk, str):
+        chunk = chunk.encode("ascii", "ignore")
+    codes = LETTER_CODES[np.frombuffer(chunk, dtype=np.uint8)]
+    return codes[codes != NOT_A_LETTER].astype(np.intp)
+
+def decodeNGramCode(code: int, n: int) -> str:
+    """
+    Converts a packed n-gram code (base 26, most significant letter first) back to its letters
+    """
+    letters = []
+    for _ in range(n):
+        code, i = divmod(int(code), 26)
+        letters.append(ALPHABET_LOWER[i])
+    return "".join(reversed(letters))
+
+"""
+End of letter encoding
+"""
+
+"""
+Streaming n-gram accumulator
+"""
+
+class NGramAccumulator:
+    """
+    Incrementally counts unigrams, bigrams and trigrams of the letters in a stream of text chunks.
+    Non-alphabetical characters are skipped, so n-grams are formed over the letters only (the same view the ciphers use).
+    Memory use is constant: counts live in fixed-size arrays and only the first and last two letters of the stream are kept,
+    which is enough to count the n-grams spanning chunk boundaries and to merge accumulators of consecutive shards.
+    """
+    def __init__(self):
+        self.unigrams = np.zeros(26, dtype=np.int64)
+        self.bigrams = np.zeros(26 ** 2, dtype=np.int64)
+        self.trigrams = np.zeros(26 ** 3, dtype=np.int64)
+        self._head = np.empty(0, dtype=np.intp)
+        self._tail = np.empty(0, dtype=np.intp)
+
+    def _countCodes(self, codes: np.ndarray, carried: int):
+        """
+        Counts the n-grams of codes that end after its first `carried` letters (which have already been counted)
+        """
+        self.unigrams += np.bincount(codes[carried:], minlength=26)
+        if len(codes) >= 2:
+            bigramCodes = codes[:-1] * 26 + codes[1:]
+            self.bigrams += np.bincount(bigramCodes[max(carried - 1, 0):], minlength=26 ** 2)
+        if len(codes) >= 3:
+            trigramCodes = (codes[:-2] * 26 + codes[1:-1]) * 26 + codes[2:]
+            self.trigrams += np.bincount(trigramCodes[max(carried - 2, 0):], minlength=26 ** 3)
+
+    def update(self, chunk):
+        """
+        Adds a chunk of text (str, bytes or any buffer) to the statistics. Returns the accumulator.
+        """
+        newCodes = encodeLetterCodes(chunk)
+        if len(newCodes) == 0:
+            return self
+        codes = np.concatenate((self._tail, newCodes))
+        self._countCodes(codes, len(self._tail))
+        self._head = np.concatenate((self._head, newCodes[:2]))[:2]
+        self._tail = codes[-2:].copy()
+        return self
+
+    def updateFromIterable(self, chunks):
+        """
+        Adds every chunk yielded by an iterable (e.g. a file opened in text or binary mode). Returns the accumulator.
+        """
+        for chunk in chunks:
+            self.update(chunk)
+        return self
+
+    def updateFromFile(self, path, chunk_size = 1 << 20):
+        """
+        Reads a file in binary mode through a single reusable buffer of chunk_size bytes and adds its contents. Returns the accumulator.
+        """
+        buffer = bytearray(chunk_size)
+        view = memoryview(buffer)
+        with open(path, "rb") as file:
+            while (bytesRead := file.readinto(buffer)):
+                self.update(view[:bytesRead])
+        return self
+
+    def merge(self, other):
+        """
+        Adds the statistics of another accumulator in place, as if its stream directly followed this one. Returns the accumulator.
+        Merging the accumulators of consecutive shards in order gives the same counts as reading the shards as one stream.
+        """
+        self.unigrams += other.unigrams
+        self.bigrams += other.bigrams
+        self.trigrams += other.trigrams
+        if len(self._tail) and len(other._head):
+            junction = np.concatenate((self._tail, other._head))
+            self.bigrams[self._tail[-1] * 26 + other._head[0]] += 1
+            for i in range(len(junction) - 2):
+                self.trigrams[(junction[i] * 26 + junction[i + 1]) * 26 + junction[i + 2]] += 1
+        self._head = np.concatenate((self._head, other._head))[:2]
+        self._tail = np.concatenate((self._tail, other._tail))[-2:]
+        return self
+
+    def __add__(self, other):
+        return NGramAccumulator().merge(self).merge(other)
+
+    def __iadd__(self, other):
+        return self.merge(other)
+
+    @property
+    def letterCount(self) -> int:
+        return int(self.unigrams.sum())
+
+    def counts(self, n: int) -> np.ndarray:
+        """
+        Returns the count array for n-grams of length n (1, 2 or 3), indexed by packed n-gram code
+        """
+        if n not in (1, 2, 3):
+            raise ValueError("Only unigrams, bigrams and trigrams are counted")
+        return (self.unigrams, self.bigrams, self.trigrams)[n - 1]
+
+    def frequencies(self, n = 1) -> np.ndarray:
+        """
+        Returns the relative frequencies of n-grams of length n, indexed by packed n-gram code
+        """
+        counts = self.counts(n)
+        total = counts.sum()
+        return counts / total if total else np.zeros(len(counts))
+
+    def mostCommon(self, n = 1, k = 10) -> list[tuple[str, int]]:
+        """
+        Returns the k most common n-grams of length n as (n-gram, count) pairs
+        """
+        counts = self.counts(n)
+        if k <= 0:
+            return []
+        k = min(k, len(counts))
+        top = np.argpartition(counts, -k)[-k:]
+        top = top[np.argsort(-counts[top], kind="stable")]
+        return [(decodeNGramCode(code, n), int(counts[code])) for code in top if counts[code] > 0]
+
+    def indexOfCoincidence(self) -> float:
+        """
+        Returns the index of coincidence of the letters seen so far
+        """
+        total = self.letterCount
+        if total < 2:
+            return 0.0
+        # Python ints, since count * (count - 1) overflows int64 once a letter has been seen about 3e9 times
+        return sum(int(count) * (int(count) - 1) for count in self.unigrams) / (total * (total - 1))
+
+"""
+End of streaming n-gram accumulator
+"""
@@ -17,4 +17,7 @@ setup(
     packages = find_packages(),
     python_requires=">=3.9",
     install_requires=["numpy", "Parametrized"],
+    entry_points={
+        "console_scripts": ["cipherloom=cipherloom.cli:main"],
+    },
 )
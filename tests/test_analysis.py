@@ -0,0 +1,109 @@
+import random
+import unittest
+from parameterized import parameterized
+from cipherloom import CaesarCipher, AffineCipher, VigenereCipher, TranspositionCipher, HillCipher
+from cipherloom.analysis import (
+    bruteForceCaesar, bruteForceAffine, bruteForceVigenere, bruteForceHill, bruteForceTransposition,
+    lazyTranspositionDecrypt, letterHistogram, TopK,
+)
+from cipherloom.keyspace import AffineKeySpace, HillKeySpace
+from cipherloom.recognizer import PlaintextRecognizer
+from cipherloom.stats import NGramAccumulator
+
+TEXT = ("It was the best of times, it was the worst of times, it was the age of wisdom, it was the age of foolishness, "
+        "it was the epoch of belief, it was the epoch of incredulity, it was the season of light, it was the season of darkness. ") * 3
+
+class TestPlaintextRecognizer(unittest.TestCase):
+    @parameterized.expand([
+        ("single chunk", [TEXT]),
+        ("letter chunks", list(TEXT)),
+        ("uneven chunks", [TEXT[i:i+17] for i in range(0, len(TEXT), 17)]),
+    ])
+    def test_scoreIndependentOfChunking(self, label, chunks):
+        recognizer = PlaintextRecognizer()
+        self.assertAlmostEqual(recognizer.score(chunks), recognizer.scoreText(TEXT))
+
+    @parameterized.expand([
+        ("caesar", CaesarCipher().encrypt(TEXT, 11)),
+        ("transposition", TranspositionCipher().encrypt(TEXT, "secret")),
+    ])
+    def test_englishBeatsCiphertext(self, label, ciphertext):
+        recognizer = PlaintextRecognizer()
+        self.assertGreater(recognizer.scoreText(TEXT), recognizer.scoreText(ciphertext))
+
+    def test_exactBoundOnlyAbortsLosers(self):
+        recognizer = PlaintextRecognizer(confidence=None)
+        ciphertext = CaesarCipher().encrypt(TEXT, 11)
+        score = recognizer.scoreText(ciphertext)
+        chunks = [ciphertext[i:i+50] for i in range(0, len(ciphertext), 50)]
+        self.assertAlmostEqual(recognizer.score(chunks, letterHistogram(ciphertext), score - 1e-9), score)
+        self.assertIsNone(recognizer.score(chunks, letterHistogram(ciphertext), recognizer.scoreText(TEXT)))
+
+    def test_fromAccumulator(self):
+        recognizer = PlaintextRecognizer.fromAccumulator(NGramAccumulator().update(TEXT))
+        self.assertEqual(bruteForceCaesar(CaesarCipher().encrypt(TEXT, 4), recognizer=recognizer)[0][1], 4)
+
+class TestBruteForce(unittest.TestCase):
+    @parameterized.expand([
+        ("caesar", bruteForceCaesar, CaesarCipher().encrypt(TEXT, 7), {}, 7),
+        ("affine", bruteForceAffine, AffineCipher().encrypt(TEXT, 5, 8), {}, (5, 8)),
+        ("vigenere key length", bruteForceVigenere, VigenereCipher().encrypt(TEXT, "KY"), {"key_length": 2}, "KY"),
+        ("vigenere candidate keys", bruteForceVigenere, VigenereCipher().encrypt(TEXT, "LEMON"), {"keys": ["APPLE", "LEMON", "MELON"]}, "LEMON"),
+        ("transposition", bruteForceTransposition, TranspositionCipher().encrypt(TEXT, "cheese"), {"key_length": 6}, (0, 4, 1, 2, 5, 3)),
+        ("hill shard", bruteForceHill, HillCipher().encrypt(TEXT, "CDFH"), {"keys": HillKeySpace(2).slice(37000, 38000)}, "cdfh"),
+    ])
+    def test_recoversKey(self, label, bruteForce, ciphertext, kwargs, expected_key):
+        score, key, plaintext = bruteForce(ciphertext, **kwargs)[0]
+        self.assertEqual(key, expected_key)
+        self.assertIn(TEXT, plaintext)
+
+    @parameterized.expand([
+        ("caesar", bruteForceCaesar, CaesarCipher(), (7,), 2, 7),
+        ("affine", bruteForceAffine, AffineCipher(), (5, 8), 3, (5, 8)),
+    ])
+    def test_noisyPrefixKeepsKey(self, label, bruteForce, cipher, args, top_k, expected_key):
+        rng = random.Random(1)
+        message = "".join(rng.choice("qwxzjkvyfpb ") for _ in range(200)) + TEXT
+        self.assertEqual(bruteForce(cipher.encrypt(message, *args), top_k=top_k)[0][1], expected_key)
+
+    def test_resultsSortedAndBounded(self):
+        results = bruteForceAffine(AffineCipher().encrypt(TEXT, 5, 8), top_k=5)
+        self.assertEqual(len(results), 5)
+        self.assertEqual([score for score, _, _ in results], sorted((score for score, _, _ in results), reverse=True))
+
+    def test_mergedShardsMatchFullSearch(self):
+        ciphertext = AffineCipher().encrypt(TEXT, 5, 8)
+        recognizer = PlaintextRecognizer()
+        full = bruteForceAffine(ciphertext, top_k=4, recognizer=recognizer)
+        merged = TopK(4)
+        for i in range(3):
+            for score, key, _ in bruteForceAffine(ciphertext, top_k=4, recognizer=recognizer, keys=AffineKeySpace().shard(i, 3)):
+                merged.push(score, key)
+        self.assertEqual([key for _, key in merged.results()], [key for _, key, _ in full])
+
+    def test_topK(self):
+        best = TopK(2)
+        for score, key in [(1.0, "a"), (3.0, "b"), (2.0, "c"), (0.5, "d"), (2.0, "e")]:
+            best.push(score, key)
+        self.assertEqual(best.results(), [(3.0, "b"), (2.0, "c")])
+        self.assertEqual(best.threshold, 2.0)
+
+    def test_earlyAbortSavesWork(self):
+        ciphertext = TranspositionCipher().encrypt(TEXT, "cheese")
+        exact, statistical = PlaintextRecognizer(), PlaintextRecognizer(confidence=4.0)
+        bruteForceTransposition(ciphertext, 6, recognizer=exact)
+        bruteForceTransposition(ciphertext, 6, recognizer=statistical)
+        self.assertLess(statistical.lettersScored * 3, exact.lettersScored)
+
+    @parameterized.expand([
+        ("standard case", "Hello World", "key"),
+        ("non-alphabetic", "Hello, World! 123", "hello"),
+        ("repeated key", "Hello welcome to the program", "cheese"),
+    ])
+    def test_lazyTranspositionDecrypt(self, label, message, key):
+        ciphertext = TranspositionCipher().encrypt(message, key)
+        for block_size in (1, 5, 64):
+            self.assertEqual("".join(lazyTranspositionDecrypt(ciphertext, key, block_size)), TranspositionCipher().decrypt(ciphertext, key))
+
+if __name__ == "__main__":
+    unittest.main()
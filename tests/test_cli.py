@@ -0,0 +1,86 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from parameterized import parameterized
+from cipherloom.cli import main
+from cipherloom.registry import getCipher, parseKey
+
+MESSAGE = "Hello, World! Welcome to the cipher.\nAttack at dawn; retreat at dusk?\n" * 5
+
+class TestCommandLine(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def _path(self, *parts):
+        return os.path.join(self.directory.name, *parts)
+
+    def _write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", newline="") as file:
+            file.write(text)
+
+    def _read(self, path):
+        with open(path, newline="") as file:
+            return file.read()
+
+    @parameterized.expand([
+        ("caesar", "caesar", "3"),
+        ("affine", "affine", "5,8"),
+        ("atbash", "atbash", None),
+        ("vigenere", "vigenere", "Cheese"),
+        ("trithemius ascending", "trithemius", "4"),
+        ("trithemius descending", "trithemius", "7,desc"),
+        ("transposition", "transposition", "cheese"),
+    ])
+    def test_segmentedMatchesWholeMessage(self, label, cipherName, key):
+        source, encrypted, decrypted = self._path("plain.txt"), self._path("cipher.txt"), self._path("round.txt")
+        self._write(source, MESSAGE)
+        self.assertEqual(main(["encrypt", cipherName, source, "-o", encrypted, "-k", key or "", "-j", "2", "--segment-size", "13"]), 0)
+        expected = getCipher(cipherName).encrypt(MESSAGE, *parseKey(cipherName, key))
+        self.assertEqual(self._read(encrypted), expected, msg=f"{label} - Encrypt")
+
+        self.assertEqual(main(["decrypt", cipherName, encrypted, "-o", decrypted, "-k", key or "", "-j", "2", "--segment-size", "13"]), 0)
+        self.assertEqual(self._read(decrypted), getCipher(cipherName).decrypt(expected, *parseKey(cipherName, key)), msg=f"{label} - Decrypt")
+
+    def test_directoryTree(self):
+        files = {"a.txt": MESSAGE, os.path.join("nested", "b.txt"): "Short one", "empty.txt": ""}
+        for name, text in files.items():
+            self._write(self._path("corpus", name), text)
+        self.assertEqual(main(["encrypt", "vigenere", self._path("corpus"), "-o", self._path("out"), "-k", "KEY", "--segment-size", "10"]), 0)
+        for name, text in files.items():
+            self.assertEqual(self._read(self._path("out", name)), getCipher("vigenere").encrypt(text, "KEY") if text else "", msg=name)
+
+    @parameterized.expand([
+        ("affine a not coprime", "affine", "2,3"),
+        ("hill not invertible", "hill", "abcd"),
+        ("hill not square", "hill", "abc"),
+    ])
+    def test_invalidKey(self, label, cipherName, key):
+        self._write(self._path("plain.txt"), MESSAGE)
+        with self.assertRaises(SystemExit) as context, redirect_stderr(io.StringIO()):
+            main(["encrypt", cipherName, self._path("plain.txt"), "-o", self._path("out.txt"), "-k", key])
+        self.assertEqual(context.exception.code, 2)
+
+    def test_manySegmentsWithSmallWindow(self):
+        self._write(self._path("plain.txt"), MESSAGE * 10)
+        self.assertEqual(main(["encrypt", "trithemius", self._path("plain.txt"), "-o", self._path("out.txt"), "-k", "3", "-j", "1", "--segment-size", "7"]), 0)
+        self.assertEqual(self._read(self._path("out.txt")), getCipher("trithemius").encrypt(MESSAGE * 10, True, 3))
+
+    @parameterized.expand([
+        ("segmented", "caesar", "3"),
+        ("whole file", "transposition", "key"),
+    ])
+    def test_workerErrorNamesFileAndRemovesOutput(self, label, cipherName, key):
+        self._write(self._path("plain.txt"), "Café")
+        stderr = io.StringIO()
+        with redirect_stderr(stderr):
+            self.assertEqual(main(["encrypt", cipherName, self._path("plain.txt"), "-o", self._path("out.txt"), "-k", key]), 1)
+        self.assertIn(self._path("plain.txt"), stderr.getvalue())
+        self.assertIn("UnicodeDecodeError", stderr.getvalue())
+        self.assertFalse(os.path.exists(self._path("out.txt")))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+from parameterized import parameterized
+from cipherloom import fast, reference
+from cipherloom.harness import runHarness, timingInputs
+
+class TestFastPaths(unittest.TestCase):
+    @parameterized.expand([
+        ("caesar", fast.CaesarCipher, "Hello World", (-3,), "Ebiil Tloia"),
+        ("rot13", fast.ROT13Cipher, "Hello, World!", (), "Uryyb, Jbeyq!"),
+        ("trithemius", fast.TrithemiusCipher, "Hello, World!", (False, 32), "Bxdce, Lcexo!"),
+        ("atbash", fast.AtbashCipher, "Hello, World!", (), "Svool, Dliow!"),
+        ("monoalphabetic", fast.MonoalphabeticCipher, "Hello, World!", ("QWERTYUIOPASDFGHJKLZXCVBNM",), "Itssg, Vgksr!"),
+        ("vigenere", fast.VigenereCipher, "Hello, World! Welcome to the cipher.", ("Cheese",), "Jlppg, Aqyph! Oinjsqw xq ali umroiv."),
+        ("transposition", fast.TranspositionCipher, "Hello, World! 123", ("hello",), "e d3H,l2lW!Xlo Xor1X"),
+        ("affine", fast.AffineCipher, "Hello, World! 123", (17, 20), "Jkzzy, Eyxzt! 123"),
+    ])
+    def test_knownVectors(self, label, cipher_class, message, cipher_args, expected):
+        cipher = cipher_class()
+        self.assertEqual(cipher.encrypt(message, *cipher_args), expected, msg=f"{label} - Encrypt")
+        self.assertEqual(cipher.decrypt(expected, *cipher_args), message if label != "transposition" else message + "XXX", msg=f"{label} - Decrypt")
+
+    @parameterized.expand([
+        ("caesar",), ("rot13",), ("trithemius",), ("atbash",), ("monoalphabetic",), ("vigenere",), ("transposition",), ("affine",),
+    ])
+    def test_matchesReference(self, cipherName):
+        report = runHarness([cipherName], sizes=(1, 2, 7, 64, 301), trials=15, seed=3)
+        self.assertTrue(all(row["fastPath"] for row in report))
+        self.assertEqual([mismatch for row in report for mismatch in row["mismatches"]], [])
+
+    def test_timingInputsSkipInvalidKeys(self):
+        messages, args = timingInputs("affine", ["Hello", "World", "Again"], [(5, 8), (2, 8), (7, 3)])
+        self.assertEqual((messages, args), (["Hello", "Again"], [(5, 8), (7, 3)]))
+
+    def test_nonAsciiFallsBackToReference(self):
+        self.assertEqual(fast.CaesarCipher().encrypt("Hello — World", 3), reference.CaesarCipher().encrypt("Hello — World", 3))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from itertools import chain, permutations
+from parameterized import parameterized
+from cipherloom.keyspace import KeySpace, CaesarKeySpace, AffineKeySpace, VigenereKeySpace, HillKeySpace, TranspositionKeySpace
+
+class TestKeySpaces(unittest.TestCase):
+    @parameterized.expand([
+        ("caesar", CaesarKeySpace(), 26),
+        ("affine", AffineKeySpace(), 312),
+        ("vigenere", VigenereKeySpace(2), 676),
+        ("transposition", TranspositionKeySpace(5), 120),
+    ])
+    def test_keyCount(self, label, space, expected):
+        self.assertEqual(len(set(space)), expected)
+
+    @parameterized.expand([
+        ("caesar", CaesarKeySpace()),
+        ("affine", AffineKeySpace()),
+        ("vigenere", VigenereKeySpace(3)),
+        ("hill", HillKeySpace(2)),
+        ("transposition", TranspositionKeySpace(6)),
+    ])
+    def test_indexRoundTrip(self, label, space):
+        for index in range(0, space.size, max(space.size // 500, 1)):
+            self.assertEqual(space.indexOf(space.keyAt(index)), index)
+
+    @parameterized.expand([
+        ("affine", AffineKeySpace(), 7),
+        ("vigenere", VigenereKeySpace(2), 5),
+        ("transposition", TranspositionKeySpace(5), 3),
+        ("more shards than keys", CaesarKeySpace(), 40),
+    ])
+    def test_shardsAreDisjointAndComplete(self, label, space, shard_count):
+        shards = [list(space.shard(i, shard_count)) for i in range(shard_count)]
+        self.assertEqual(list(chain.from_iterable(shards)), list(space))
+
+    def test_transpositionOrder(self):
+        self.assertEqual(list(TranspositionKeySpace(4)), list(permutations(range(4))))
+
+    def test_hillKeysAreInvertible(self):
+        keys = list(HillKeySpace(2).slice(0, 2000))
+        self.assertNotIn("aaaa", keys)
+        self.assertIn("abbd", keys)
+        self.assertTrue(all(len(key) == 4 for key in keys))
+
+    def test_invalidShard(self):
+        with self.assertRaises(ValueError):
+            CaesarKeySpace().shard(3, 3)
+
+    def test_baseIsAbstract(self):
+        with self.assertRaises(TypeError):
+            KeySpace()
+
+if __name__ == "__main__":
+    unittest.main()
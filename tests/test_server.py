@@ -0,0 +1,160 @@
+import asyncio
+import json
+import unittest
+from parameterized import parameterized
+from cipherloom import CaesarCipher, VigenereCipher
+from cipherloom.server import BatchingCipherService, CipherServer
+
+class FakeWriter:
+    def __init__(self):
+        self.lines = []
+
+    def write(self, data):
+        self.lines.extend(json.loads(line) for line in data.decode().splitlines())
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        pass
+
+    async def wait_closed(self):
+        pass
+
+class BlockedWriter(FakeWriter):
+    def __init__(self):
+        super().__init__()
+        self.unblocked = asyncio.Event()
+
+    async def drain(self):
+        await self.unblocked.wait()
+
+class ResetWriter(FakeWriter):
+    async def drain(self):
+        raise ConnectionResetError()
+
+class TestBatchingCipherService(unittest.IsolatedAsyncioTestCase):
+    async def test_groupsConcurrentRequests(self):
+        service = BatchingCipherService(max_delay=0.05, max_batch_size=100)
+        messages = [f"Hello, World {i}!" for i in range(10)]
+        requests = [service.submit("encrypt", "caesar", (3,), message) for message in messages]
+        requests += [service.submit("encrypt", "vigenere", ("KEY",), message) for message in messages]
+        results = await asyncio.gather(*requests)
+
+        self.assertEqual(results[:10], [CaesarCipher().encrypt(message, 3) for message in messages])
+        self.assertEqual(results[10:], [VigenereCipher().encrypt(message, "KEY") for message in messages])
+        metrics = service.metrics()
+        self.assertEqual((metrics["batches"], metrics["maxBatchSize"], metrics["queueDepth"], metrics["inFlight"]), (2, 10, 0, 0))
+
+    @parameterized.expand([
+        ("splits full batches", 4, 10, {4: 2, 2: 1}),
+        ("single request batches", 1, 3, {1: 3}),
+    ])
+    async def test_maxBatchSize(self, label, max_batch_size, count, expected):
+        service = BatchingCipherService(max_delay=0.05, max_batch_size=max_batch_size)
+        await asyncio.gather(*[service.submit("decrypt", "caesar", (1,), "b") for _ in range(count)])
+        self.assertEqual(service.metrics()["batchSizes"], expected)
+
+    async def test_queueDepth(self):
+        service = BatchingCipherService(max_delay=10)
+        request = asyncio.ensure_future(service.submit("encrypt", "rot13", (), "Hello"))
+        await asyncio.sleep(0)
+        self.assertEqual(service.metrics()["queueDepth"], 1)
+        await service.flush()
+        self.assertEqual(await request, "Uryyb")
+        self.assertEqual(service.metrics()["queueDepth"], 0)
+
+    async def test_errorsStayInTheirRequest(self):
+        service = BatchingCipherService(max_delay=0.01)
+        valid = service.submit("encrypt", "affine", (5, 8), "Hello World")
+        invalid = service.submit("encrypt", "affine", (2, 8), "Hello World")
+        with self.assertWarns(Warning):
+            results = await asyncio.gather(valid, invalid, return_exceptions=True)
+        self.assertEqual(results[0], "Rclla Oaplx")
+        self.assertIsInstance(results[1], ValueError)
+
+class TestCipherServer(unittest.IsolatedAsyncioTestCase):
+    async def test_responsesInRequestOrder(self):
+        server = CipherServer(BatchingCipherService(max_delay=0.01))
+        reader = asyncio.StreamReader()
+        requests = [
+            {"id": 1, "mode": "encrypt", "cipher": "vigenere", "key": "KEY", "message": "Hello World"},
+            {"id": 2, "mode": "encrypt", "cipher": "caesar", "key": "3", "message": "Hello World"},
+            {"id": 3, "mode": "decrypt", "cipher": "caesar", "key": "3", "message": "Khoor Zruog"},
+            {"id": 4, "mode": "encrypt", "cipher": "enigma", "key": "3", "message": "Hello"},
+        ]
+        for request in requests:
+            reader.feed_data(json.dumps(request).encode() + b"\n")
+        reader.feed_data(b"not json\n")
+        reader.feed_eof()
+        writer = FakeWriter()
+        await server.handleConnection(reader, writer)
+
+        self.assertEqual([response.get("id") for response in writer.lines], [1, 2, 3, 4, None])
+        self.assertEqual([response.get("result") for response in writer.lines[:3]], ["Rijvs Uyvjn", "Khoor Zruog", "Hello World"])
+        self.assertIn("error", writer.lines[3])
+        self.assertIn("error", writer.lines[4])
+
+    async def test_oversizedLine(self):
+        server = CipherServer(BatchingCipherService(max_delay=0.01), line_limit=128)
+        reader = asyncio.StreamReader(limit=128)
+        request = {"mode": "encrypt", "cipher": "caesar", "key": "3"}
+        reader.feed_data(json.dumps({"id": 1, **request, "message": "Hello"}).encode() + b"\n")
+        reader.feed_data(json.dumps({"id": 2, **request, "message": "x" * 500}).encode() + b"\n")
+        reader.feed_data(json.dumps({"id": 3, **request, "message": "World"}).encode() + b"\n")
+        reader.feed_eof()
+        writer = FakeWriter()
+        await server.handleConnection(reader, writer)
+
+        self.assertEqual(writer.lines[0], {"id": 1, "result": "Khoor"})
+        self.assertIn("128 byte limit", writer.lines[1]["error"])
+        self.assertEqual(writer.lines[2], {"id": 3, "result": "Zruog"})
+        self.assertEqual(len(writer.lines), 3)
+
+    async def test_clientResetCancelsQueuedRequests(self):
+        server = CipherServer(BatchingCipherService(max_delay=0.01))
+        reader = asyncio.StreamReader()
+        for i in range(5):
+            reader.feed_data(json.dumps({"id": i, "mode": "encrypt", "cipher": "caesar", "key": "3", "message": "Hello"}).encode() + b"\n")
+        reader.feed_eof()
+        tasks = asyncio.all_tasks()
+        await server.handleConnection(reader, ResetWriter())
+
+        leftover = [task for task in asyncio.all_tasks() - tasks if task is not asyncio.current_task()]
+        await asyncio.gather(*leftover, return_exceptions=True)
+        self.assertTrue(all(task.cancelled() or task.exception() is None for task in leftover))
+
+    async def test_largeHillKeyDoesNotBlockTheLoop(self):
+        server = CipherServer(BatchingCipherService(max_delay=0.01))
+        request = {"mode": "encrypt", "message": "Hello World"}
+        hill = asyncio.create_task(server.handleRequest(json.dumps({"id": 1, **request, "cipher": "hill", "key": "b" * 81})))
+        caesar = await server.handleRequest(json.dumps({"id": 2, **request, "cipher": "caesar", "key": "3"}))
+
+        self.assertEqual(caesar["result"], "Khoor Zruog")
+        self.assertFalse(hill.done())
+        self.assertIn("not invertible", (await hill)["error"])
+
+    async def test_pipelinedRequestsAreBounded(self):
+        service = BatchingCipherService(max_delay=0.001)
+        server = CipherServer(service, max_pending=4)
+        reader = asyncio.StreamReader()
+        for i in range(50):
+            reader.feed_data(json.dumps({"id": i, "mode": "encrypt", "cipher": "caesar", "key": "3", "message": "Hello"}).encode() + b"\n")
+        reader.feed_eof()
+        writer = BlockedWriter()
+        connection = asyncio.create_task(server.handleConnection(reader, writer))
+        await asyncio.sleep(0.05)
+        self.assertLessEqual(service.metrics()["requests"], 6)
+
+        writer.unblocked.set()
+        await connection
+        self.assertEqual([response["id"] for response in writer.lines], list(range(50)))
+
+    async def test_metricsRequest(self):
+        server = CipherServer(BatchingCipherService())
+        response = await server.handleRequest(json.dumps({"id": 7, "mode": "metrics"}))
+        self.assertEqual(response["id"], 7)
+        self.assertEqual(response["metrics"]["queueDepth"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
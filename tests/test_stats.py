@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+from collections import Counter
+from parameterized import parameterized
+from cipherloom.stats import NGramAccumulator
+from cipherloom.utils.string_utils import filterAlphabetical
+
+def naiveCounts(text, n):
+    letters = filterAlphabetical(text).lower()
+    return Counter(letters[i:i+n] for i in range(len(letters) - n + 1))
+
+class TestNGramAccumulator(unittest.TestCase):
+    TEXT = "Hello, World! The quick brown fox jumps over the lazy dog. 123 Attack at dawn?"
+
+    def _assertMatchesNaive(self, accumulator, text):
+        for n in (1, 2, 3):
+            expected = naiveCounts(text, n)
+            self.assertEqual(dict(accumulator.mostCommon(n, 26 ** n)), dict(expected), msg=f"{n}-grams")
+
+    @parameterized.expand([
+        ("single chunk", len(TEXT)),
+        ("one character chunks", 1),
+        ("two character chunks", 2),
+        ("uneven chunks", 7),
+    ])
+    def test_chunkBoundaries(self, label, chunk_size):
+        accumulator = NGramAccumulator()
+        accumulator.updateFromIterable(self.TEXT[i:i+chunk_size] for i in range(0, len(self.TEXT), chunk_size))
+        self._assertMatchesNaive(accumulator, self.TEXT)
+
+    @parameterized.expand([
+        ("even split", 40),
+        ("single letter shard", 1),
+        ("punctuation shard", 12),
+        ("empty shard", 0),
+    ])
+    def test_mergeShards(self, label, split):
+        shards = [self.TEXT[:split], self.TEXT[split:split+1], self.TEXT[split+1:]]
+        merged = NGramAccumulator()
+        for shard in shards:
+            merged += NGramAccumulator().update(shard)
+        self._assertMatchesNaive(merged, self.TEXT)
+
+    def test_updateFromFile(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "corpus.txt")
+            with open(path, "w") as file:
+                file.write(self.TEXT * 50)
+            accumulator = NGramAccumulator().updateFromFile(path, chunk_size=5)
+        self._assertMatchesNaive(accumulator, self.TEXT * 50)
+
+    @parameterized.expand([
+        ("zero", 0, []),
+        ("negative", -1, []),
+        ("top two", 2, [("l", 3), ("o", 2)]),
+    ])
+    def test_mostCommon(self, label, k, expected):
+        self.assertEqual(NGramAccumulator().update("hello world").mostCommon(1, k), expected)
+
+    @parameterized.expand([
+        ("uniform", "abcdefghijklmnopqrstuvwxyz", 0.0),
+        ("repeated letter", "aaaa", 1.0),
+        ("mixed case", "AaBb", 1 / 3),
+        ("too short", "a", 0.0),
+    ])
+    def test_indexOfCoincidence(self, label, text, expected):
+        self.assertAlmostEqual(NGramAccumulator().update(text).indexOfCoincidence(), expected)
+
+    def test_indexOfCoincidenceLargeCounts(self):
+        accumulator = NGramAccumulator()
+        accumulator.unigrams[:2] = 4_000_000_000
+        self.assertAlmostEqual(accumulator.indexOfCoincidence(), 0.5)
+
+if __name__ == "__main__":
+    unittest.main()